@@ -76,15 +76,15 @@ class _AsyncEventLoop:
 
         with self._lock:
             task = _AsyncEventLoop._Task(func, *args, **kwargs)
-            _log.debug(f"[async_event_loop] Enqueue {func.__name__} with args:"
-                       f" {args} {kwargs}")
+            _log.debug("[async_event_loop] Enqueue %s with args: %s %s",
+                       func.__name__, args, kwargs)
             self._run_queue.append(task)
 
         while True:
             with self._cv:
                 self._cv.wait_for(lambda: task.task_id in self._return_vals)
             with self._lock:
-                _log.debug(f"[async_event_loop] Completed {func.__name__}")
+                _log.debug("[async_event_loop] Completed %s", func.__name__)
                 return self._return_vals.pop(task.task_id)
 
     def _thread_main(self):
@@ -25,9 +25,12 @@
 # ----------------------------------------------------------------------------
 """Open3D visualization plugin for TensorBoard."""
 import os
+import gzip
+import hashlib
 import sys
 import threading
-import json
+from itertools import count
+from operator import attrgetter
 
 import numpy as np
 from tensorboard.plugins import base_plugin
@@ -40,9 +43,7 @@ import open3d as o3d
 # TODO: Check for GPU / EGL else TensorBoard will crash.
 from open3d.visualization import O3DVisualizer
 from open3d.visualization import gui
-from open3d.visualization import rendering
 from open3d.visualization import webrtc_server
-from open3d.visualization.tensorboard_plugin import plugin_data_pb2
 # Set window system before the GUI event loop
 webrtc_server.enable_webrtc()
 from open3d.visualization.async_event_loop import async_event_loop
@@ -50,6 +51,24 @@ from open3d.visualization.tensorboard_plugin import metadata
 from open3d.visualization.tensorboard_plugin.util import Open3DPluginDataReader
 from open3d.visualization.tensorboard_plugin.util import _log
 
+try:
+    import orjson
+
+    def _json_dumps(obj):
+        """Serialize ``obj`` to a JSON ``str`` with orjson."""
+        return orjson.dumps(obj).decode()
+
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
 
 def _postprocess(geometry):
     """Post process geometry before displaying to account for WIP
@@ -141,14 +160,14 @@ class Open3DPluginWindow:
               }
             }
         """
-        _log.debug(f"[DC message recv] {message}")
+        _log.debug("[DC message recv] %s", message)
         self.data_reader.reload_events()
         self._validate_run(self.run)
         self._validate_tags(self.tags, non_empty=True)
         self._validate_step(self.step)
         self._validate_batch_idx(self.batch_idx)
         # Compose reply
-        message = json.loads(message)
+        message = _json_loads(message)
         message["run_to_tags"] = self.data_reader.run_to_tags
         message["current"] = {
             "run": self.run,
@@ -159,16 +178,17 @@ class Open3DPluginWindow:
             "batch_idx": self.batch_idx,
             "wall_time": self.wall_time
         }
-        return json.dumps(message)
+        return _json_dumps(message)
 
     def _validate_run(self, selected_run):
         """Validate selected_run. Use self.run or the first valid run in case
         selected run is invalid. Clear cached events.
         """
-        if selected_run not in self.data_reader.run_to_tags:
+        run_to_tags = self.data_reader.run_to_tags
+        if selected_run not in run_to_tags:
             selected_run = self.run
-        if selected_run not in self.data_reader.run_to_tags:
-            selected_run = next(iter(self.data_reader.run_to_tags))
+        if selected_run not in run_to_tags:
+            selected_run = next(iter(run_to_tags))
         self.run = selected_run
         self.all_tensor_events = self.data_reader.tensor_events(self.run)
 
@@ -178,21 +198,17 @@ class Open3DPluginWindow:
         is empty or invalid. Also loads all tensor data for validated run-tags
         combination and unloads data for unselected tags.
         """
-        selected_tags = [
-            t for t in selected_tags
-            if t in self.data_reader.run_to_tags[self.run]
-        ]
-        if non_empty and len(selected_tags) == 0 and len(
-                self.data_reader.run_to_tags[self.run]) > 0:
-            selected_tags = self.data_reader.run_to_tags[
-                self.run][:1]  # Only first tag default
+        run_tags = self.data_reader.run_to_tags[self.run]
+        selected_tags = [t for t in selected_tags if t in run_tags]
+        if non_empty and len(selected_tags) == 0 and len(run_tags) > 0:
+            selected_tags = run_tags[:1]  # Only first tag default
         self.tags = selected_tags
         if len(selected_tags) == 0:  # No tags in this run
             return
-        self.step_to_idx = {
-            tevt.step: idx
-            for idx, tevt in enumerate(self.all_tensor_events[self.tags[0]])
-        }
+        # {step: idx}, built with C iterators over the tensor events
+        self.step_to_idx = dict(
+            zip(map(attrgetter("step"), self.all_tensor_events[self.tags[0]]),
+                count()))
         self.step_limits = [min(self.step_to_idx), max(self.step_to_idx)]
 
     def _validate_step(self, selected_step):
@@ -209,9 +225,8 @@ class Open3DPluginWindow:
         self.wall_time = self.all_tensor_events[self.tags[0]][
             self.idx].wall_time
 
-        metadata_proto = plugin_data_pb2.Open3DPluginData()
-        metadata_proto.ParseFromString(self.all_tensor_events[self.tags[0]][
-            self.idx].tensor_proto.string_val[0])
+        metadata_proto = self.data_reader.read_metadata(
+            self.run, self.tags[0], self.step, self.step_to_idx)
         self.batch_size = len(metadata_proto.batch_index.start_size)
 
     def _validate_batch_idx(self, selected_batch_idx):
@@ -259,8 +274,8 @@ class Open3DPluginWindow:
               "status": OK
             }
         """
-        _log.debug(f"[DC message recv] {message}")
-        message = json.loads(message)
+        _log.debug("[DC message recv] %s", message)
+        message = _json_loads(message)
         self._validate_run(message["run"])
         self._validate_tags(message["tags"])
         self._validate_step(int(message["step"]))
@@ -279,7 +294,7 @@ class Open3DPluginWindow:
             "wall_time": self.wall_time,
             "status": status
         }
-        return json.dumps(message)
+        return _json_dumps(message)
 
     def _update_scene(self):
         """Update scene by adding / removing geometry elements and redraw.
@@ -294,8 +309,8 @@ class Open3DPluginWindow:
                     geometry = self.data_reader.read_geometry(
                         self.run, tag, self.step, self.batch_idx,
                         self.step_to_idx)
-                    _log.debug(
-                        f"Displaying geometry {geometry_name}:{geometry}")
+                    _log.debug("Displaying geometry %s:%s", geometry_name,
+                               geometry)
                     pp_geometry = _postprocess(geometry)
                     async_event_loop.run_sync(self.window.add_geometry,
                                               geometry_name, pp_geometry)
@@ -307,7 +322,7 @@ class Open3DPluginWindow:
 
         for current_item in self.geometry_list:
             if current_item not in new_geometry_list:
-                _log.debug(f"Removing geometry {current_item}")
+                _log.debug("Removing geometry %s", current_item)
                 async_event_loop.run_sync(self.window.remove_geometry,
                                           current_item)
         if len(self.geometry_list
@@ -364,9 +379,21 @@ class Open3DPlugin(base_plugin.TBPlugin):
     _RESOURCE_PATH = os.path.join(os.path.dirname(__file__), "..", "..",
                                   "resources")
     _PLUGIN_DIRECTORY_PATH_PART = "/data/plugin/" + metadata.PLUGIN_NAME + "/"
+    # request.path[_ENTRY_POINT_OFFSET:] is the WebRTC HTTP API entry point
+    _ENTRY_POINT_OFFSET = len(_PLUGIN_DIRECTORY_PATH_PART) - 1
     # Browser security: Do not guess response content type by inspection.
     _HEADERS = [("X-Content-Type-Options", "nosniff")]
     _ERROR_RESPONSE = werkzeug.Response(headers=_HEADERS)
+    # Responses that create or change window / WebRTC state must not be reused.
+    _NO_CACHE_HEADERS = _HEADERS + [("Cache-Control", "no-store")]
+    # es_module_path: ES module to use as an entry point to this plugin.
+    #     A `str` that is a key in the result of `get_plugin_apps()`, or
+    #     `None` for legacy plugins bundled with TensorBoard as part of
+    #     `webfiles.zip`. Mutually exclusive with legacy `element_name`
+    _FRONTEND_METADATA = base_plugin.FrontendMetadata(
+        es_module_path="/index.js")
+    # Browser cache lifetime (s) for static JS / CSS files.
+    _STATIC_MAX_AGE = 3600
 
     def __init__(self, context):
         """Instantiates Open3D plugin.
@@ -379,12 +406,13 @@ class Open3DPlugin(base_plugin.TBPlugin):
         self.window_lock = threading.Lock()  # protect self._windows
         self._http_api_lock = threading.Lock()
         self._windows = {}
+        # {filename: (mtime, etag, {content_encoding: contents})}
+        self._static_cache = {}
+        self._static_cache_lock = threading.Lock()
         webrtc_server.disable_http_handshake()
         # Dummy window to ensure GUI remains active even if all user windows are
-        # closed.
-        self._dummy_window = async_event_loop.run_sync(
-            gui.Application.instance.create_window, "Open3D Dummy Window", 32,
-            32)
+        # closed. Created on the first new_window request.
+        self._dummy_window = None
 
     def get_plugin_apps(self):
         """Returns a set of WSGI applications that the plugin implements.
@@ -426,11 +454,7 @@ class Open3DPlugin(base_plugin.TBPlugin):
         (for legacy plugins) an `element_name`, and are encouraged to
         set any other relevant attributes.
         """
-        return base_plugin.FrontendMetadata(es_module_path="/index.js")
-        # es_module_path: ES module to use as an entry point to this plugin.
-        #     A `str` that is a key in the result of `get_plugin_apps()`, or
-        #     `None` for legacy plugins bundled with TensorBoard as part of
-        #     `webfiles.zip`. Mutually exclusive with legacy `element_name`
+        return self._FRONTEND_METADATA
 
     @wrappers.Request.application
     def _new_window(self, request):
@@ -440,20 +464,25 @@ class Open3DPlugin(base_plugin.TBPlugin):
         win_height = min(2400,
                          max(480, int(float(request.args.get('height', 768)))))
 
+        with self.window_lock:
+            if self._dummy_window is None:
+                self._dummy_window = async_event_loop.run_sync(
+                    gui.Application.instance.create_window,
+                    "Open3D Dummy Window", 32, 32)
         this_window = Open3DPluginWindow(self.data_reader,
                                          "Open3D for Tensorboard", win_width,
                                          win_height)
         with self.window_lock:
             self._windows[this_window.window.uid] = this_window
 
-        response = json.dumps({
+        response = _json_dumps({
             "window_id": this_window.window.uid,
             "logdir": self._logdir
         })
         this_window.init_done.wait()  # Wait for WebRTC initialization
         return werkzeug.Response(response,
                                  content_type="application/json",
-                                 headers=self._HEADERS)
+                                 headers=self._NO_CACHE_HEADERS)
 
     @wrappers.Request.application
     def _close_window(self, request):
@@ -468,38 +497,36 @@ class Open3DPlugin(base_plugin.TBPlugin):
         async_event_loop.run_sync(self._windows[this_window_id].window.close)
         with self.window_lock:
             del self._windows[this_window_id]
-        _log.debug(f"Window {this_window_id} closed.")
+        _log.debug("Window %s closed.", this_window_id)
         return werkzeug.Response(f"Closed window {this_window_id}",
                                  content_type="text/plain",
-                                 headers=self._HEADERS)
+                                 headers=self._NO_CACHE_HEADERS)
 
     @wrappers.Request.application
     def _webrtc_http_api(self, request):
+        if len(self._windows) == 0:
+            raise werkzeug.exceptions.BadRequest(
+                description="No windows exist to service this request: "
+                f"{request}",
+                response=self._ERROR_RESPONSE)
+        entry_point = request.path[self._ENTRY_POINT_OFFSET:]
+        query_string = (b'?' + request.query_string
+                        if request.query_string else b'')
+        data = request.get_data()
         try:
-            entry_point = request.path[(len(self._PLUGIN_DIRECTORY_PATH_PART) -
-                                        1):]
-            query_string = (b'?' + request.query_string
-                            if request.query_string else b'')
-            data = request.get_data()
-            if len(self._windows) == 0:
-                raise werkzeug.exceptions.BadRequest(
-                    description="No windows exist to service this request: "
-                    f"{request}",
-                    response=self._ERROR_RESPONSE)
-
             with self._http_api_lock:
                 response = webrtc_server.call_http_api(entry_point,
                                                        query_string, data)
-
-        except RuntimeError:
+        except RuntimeError as err:
+            _log.debug("WebRTC HTTP API request %s ignored: %s", entry_point,
+                       err)
             raise werkzeug.exceptions.BadRequest(
                 description="Request is not a function call, ignored: "
                 f"{request}",
                 response=self._ERROR_RESPONSE)
-        else:
-            return werkzeug.Response(response,
-                                     content_type="application/json",
-                                     headers=self._HEADERS)
+        return werkzeug.Response(response,
+                                 content_type="application/json",
+                                 headers=self._NO_CACHE_HEADERS)
 
     @wrappers.Request.application
     def _serve_js(self, request):
@@ -521,16 +548,58 @@ class Open3DPlugin(base_plugin.TBPlugin):
                 description=f"JS file {request.path} does not exist.",
                 response=self._ERROR_RESPONSE)
 
-        with open(js_file) as infile:
-            return werkzeug.Response(infile.read(),
-                                     content_type="application/javascript",
-                                     headers=self._HEADERS)
+        return self._static_response(request, js_file,
+                                     "application/javascript; charset=utf-8")
 
     @wrappers.Request.application
-    def _serve_css(self, unused_request):
-        with open(
-                os.path.join(os.path.dirname(__file__), "frontend",
-                             "style.css")) as cssfile:
-            return werkzeug.Response(cssfile.read(),
-                                     content_type="text/css",
+    def _serve_css(self, request):
+        return self._static_response(
+            request,
+            os.path.join(os.path.dirname(__file__), "frontend", "style.css"),
+            "text/css; charset=utf-8")
+
+    def _read_static_file(self, filename):
+        """Read a static frontend file as bytes. File contents are cached in
+        memory, along with gzip (and brotli, if available) compressed copies,
+        and re-read only if the file modification time changes.
+
+        Returns:
+            Tuple of ETag computed from the contents and dict mapping content
+            encoding (``identity``, ``gzip``, ``br``) to encoded contents.
+        """
+        mtime = os.stat(filename).st_mtime_ns
+        with self._static_cache_lock:
+            cached = self._static_cache.get(filename)
+        if cached is not None and cached[0] == mtime:
+            return cached[1:]
+        with open(filename, "rb") as infile:
+            contents = infile.read()
+        etag = hashlib.sha1(contents).hexdigest()
+        encoded = {}  # Preferred encoding first
+        if brotli is not None:
+            encoded["br"] = brotli.compress(contents, quality=11)
+        encoded["gzip"] = gzip.compress(contents, compresslevel=9)
+        encoded["identity"] = contents
+        with self._static_cache_lock:
+            self._static_cache[filename] = (mtime, etag, encoded)
+        _log.debug("Static file %s (re)loaded.", filename)
+        return etag, encoded
+
+    def _static_response(self, request, filename, content_type):
+        """Serve a static frontend file with browser caching enabled, using
+        the best content encoding accepted by the browser. Returns 304 Not
+        Modified if the browser copy is current."""
+        etag, encoded = self._read_static_file(filename)
+        encoding = request.accept_encodings.best_match(encoded,
+                                                       default="identity")
+        response = werkzeug.Response(encoded[encoding],
+                                     content_type=content_type,
                                      headers=self._HEADERS)
+        if encoding != "identity":
+            response.content_encoding = encoding
+            etag = f"{etag}-{encoding}"
+        response.vary.add("Accept-Encoding")
+        response.set_etag(etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = self._STATIC_MAX_AGE
+        return response.make_conditional(request)
@@ -127,13 +127,13 @@ class LRUCache:
         self.rwlock.release_read()
         if value is None:
             self.misses += 1
-            _log.debug(str(self))
+            _log.debug("%s", self)
             return None
         self.rwlock.acquire_write()
         self.cache.move_to_end(key)
         self.rwlock.release_write()
         self.hits += 1
-        _log.debug(str(self))
+        _log.debug("%s", self)
         return value
 
     def put(self, key, value):
@@ -145,7 +145,7 @@ class LRUCache:
         if len(self.cache) > self.max_items:
             self.cache.popitem(last=False)
         self.rwlock.release_write()
-        _log.debug(str(self))
+        _log.debug("%s", self)
 
     def clear(self):
         """Invalidate cache."""
@@ -178,6 +178,8 @@ class Open3DPluginDataReader:
         self._event_lock = threading.Lock()  # Protect TB event file data
         # Geometry data reading
         self._tensor_events = dict()
+        # Parsed geometry metadata {(run, tag, step): Open3DPluginData}
+        self._metadata_cache = dict()
         self.geometry_cache = LRUCache(max_items=cache_max_items)
         self._file_handles = {}  # {filename, (open_handle, read_lock)}
         self._file_handles_lock = threading.Lock()
@@ -192,6 +194,7 @@ class Open3DPluginDataReader:
                 run: list(tagdict.keys()) for run, tagdict in run_tags.items()
             }
             self._tensor_events = dict()  # Invalidate index
+            self._metadata_cache = dict()
         # Close all open files
         with self._file_handles_lock:
             while len(self._file_handles) > 0:
@@ -199,7 +202,7 @@ class Open3DPluginDataReader:
                 with file_handle[1]:
                     file_handle[0].close()
 
-        _log.debug(f"Event data reloaded: {self._run_to_tags}")
+        _log.debug("Event data reloaded: %s", self._run_to_tags)
 
     def is_active(self):
         """Do we have any Open3D data to display?"""
@@ -221,15 +224,30 @@ class Open3DPluginDataReader:
                 }
             return self._tensor_events[run]
 
+    def read_metadata(self, run, tag, step, step_to_idx):
+        """Read Open3D plugin metadata for a geometry from the TB event data.
+        Parsed metadata is cached till the next ``reload_events()``.
+
+        Return:
+            plugin_data_pb2.Open3DPluginData: Parsed metadata.
+        """
+        cache_key = (run, tag, step)
+        with self._event_lock:
+            metadata_proto = self._metadata_cache.get(cache_key)
+        if metadata_proto is None:
+            idx = step_to_idx[step]
+            metadata_proto = plugin_data_pb2.Open3DPluginData()
+            metadata_proto.ParseFromString(
+                self.tensor_events(run)[tag][idx].tensor_proto.string_val[0])
+            with self._event_lock:
+                self._metadata_cache[cache_key] = metadata_proto
+        return metadata_proto
+
     def read_geometry(self, run, tag, step, batch_idx, step_to_idx):
         """Geometry reader from msgpack files.
         TODO(ssheorey): Add CRC-32C
         """
-        idx = step_to_idx[step]
-        metadata_proto = plugin_data_pb2.Open3DPluginData()
-        run_tensor_events = self.tensor_events(run)
-        metadata_proto.ParseFromString(
-            run_tensor_events[tag][idx].tensor_proto.string_val[0])
+        metadata_proto = self.read_metadata(run, tag, step, step_to_idx)
         data_dir = PluginDirectory(os.path.join(self.logdir, run),
                                    metadata.PLUGIN_NAME)
         filename = os.path.join(data_dir, metadata_proto.batch_index.filename)
@@ -269,7 +287,7 @@ class Open3DPluginDataReader:
                     f"Mismatch between TensorFlow event (tag={tag}, step={step})"
                     f" and msgpack (tag={msg_tag}, step={msg_step}) data. "
                     "Possible data corruption.")
-            _log.debug(f"Geometry {cache_key} reading successful!")
+            _log.debug("Geometry %s reading successful!", cache_key)
             self.geometry_cache.put(cache_key, geometry)
 
         # Fill in properties by reference
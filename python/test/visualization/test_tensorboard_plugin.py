@@ -231,6 +231,13 @@ def test_plugin_data_reader(geometry_data):
     assert reader.is_active()
     assert reader.run_to_tags == {'.': ['cube', 'cube_pcd', 'cube_ls']}
     step_to_idx = {i: i for i in range(3)}
+    metadata_proto = reader.read_metadata(".", "cube", 0, step_to_idx)
+    assert len(metadata_proto.batch_index.start_size) == max_outputs
+    # Parsed metadata is cached till event data is reloaded
+    assert reader.read_metadata(".", "cube", 0, step_to_idx) is metadata_proto
+    reader.reload_events()
+    assert reader.read_metadata(".", "cube", 0,
+                                step_to_idx) is not metadata_proto
     for step in range(3):
         for batch_idx in range(max_outputs):
             cube[batch_idx].paint_uniform_color(colors[step][batch_idx])